@@ -6,11 +6,16 @@ This layer stays thin - business logic is in services.
 
 import os
 import re
-from urllib.parse import urlparse
-from typing import Generator
+import time
+import asyncio
+import logging
+from functools import partial
+from typing import AsyncGenerator, Awaitable, Callable, Optional, Mapping, Tuple
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import StreamingResponse, JSONResponse
+import anyio
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from starlette.responses import Response
 
 from models.video import (
     VideoInfoRequest, 
@@ -21,63 +26,240 @@ from models.video import (
 )
 from services.ytdlp_service import get_ytdlp_service
 from utils.file_cleanup import cleanup_file_after_response
+from utils.uring_reader import uring_fd_iter
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["download"])
 
+# Compiled once at import: strips characters unsafe for Content-Disposition
+_FILENAME_SAFE_RE = re.compile(r'[^\w\s\-_.]')
+
+# Content types by file extension
+_CONTENT_TYPES = {
+    '.mp4': 'video/mp4',
+    '.mkv': 'video/x-matroska',
+    '.webm': 'video/webm',
+    '.avi': 'video/x-msvideo',
+    '.mp3': 'audio/mpeg',
+    '.m4a': 'audio/mp4',
+    '.opus': 'audio/opus',
+    '.ogg': 'audio/ogg',
+}
+
+
+def _height_from_resolution(resolution: Optional[str]) -> Optional[int]:
+    """Extract the pixel height from a 'WxH' resolution string, if present"""
+    if not resolution or 'x' not in resolution:
+        return None
+    h = resolution.rsplit('x', 1)[1].removesuffix('p')
+    return int(h) if h.isdigit() else None
+
 
 def validate_url(url: str) -> bool:
     """
     Validate that the URL is a valid video URL.
-    
+    Checks the scheme prefix and a non-empty host directly instead of
+    paying for a full urlparse on every request.
+
     Args:
         url: URL to validate
-        
+
     Returns:
         True if valid, False otherwise
     """
-    if not url or not isinstance(url, str):
+    if not isinstance(url, str):
         return False
-    
-    try:
-        parsed = urlparse(url)
-        # Must have scheme and netloc
-        if not parsed.scheme or not parsed.netloc:
-            return False
-        # Must be http or https
-        if parsed.scheme not in ('http', 'https'):
-            return False
-        return True
-    except Exception:
+
+    # Must be http or https; schemes are case-insensitive
+    prefix = url[:8].lower()
+    if prefix.startswith('https://'):
+        host_start = 8
+    elif prefix.startswith('http://'):
+        host_start = 7
+    else:
         return False
 
+    # Must have a non-empty netloc: the host ends at the first path,
+    # query, or fragment delimiter
+    host_end = len(url)
+    for delim in ('/', '?', '#'):
+        pos = url.find(delim, host_start)
+        if pos != -1 and pos < host_end:
+            host_end = pos
+    return host_end > host_start
+
+
+# Cap simultaneous downloads: each one holds a read buffer, kernel socket
+# buffer, and a yt-dlp temp file, so unbounded concurrency can OOM the worker
+MAX_CONCURRENT_DOWNLOADS = int(os.environ.get("MAX_CONCURRENT_DOWNLOADS", "4"))
+_DOWNLOAD_SEMAPHORE = anyio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+
+# 1 MiB chunks amortize syscall and ASGI-send overhead on multi-hundred-MB files
+STREAM_CHUNK_SIZE = 1024 * 1024
+
 
-def file_iterator(file_path: str, chunk_size: int = 8192) -> Generator[bytes, None, None]:
+async def _pipe_iterator(
+    process: asyncio.subprocess.Process,
+    first_chunk: bytes,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> AsyncGenerator[bytes, None]:
     """
-    Generator that yields file chunks for streaming.
-    
-    Args:
-        file_path: Path to the file to stream
-        chunk_size: Size of each chunk in bytes
-        
-    Yields:
-        Bytes chunks of the file
+    Stream an ffmpeg pipe's stdout to the client. The caller has already
+    read (and passes in) the first chunk. Process teardown and permit
+    release live in _finish_pipe, run from the response object itself, so
+    they happen even if this generator is never started.
     """
-    with open(file_path, 'rb') as f:
-        while chunk := f.read(chunk_size):
-            yield chunk
+    yield first_chunk
+    while chunk := await process.stdout.read(chunk_size):
+        yield chunk
+    await process.wait()
+
+
+async def _finish_pipe(process: asyncio.subprocess.Process) -> None:
+    """
+    Response-level cleanup for the pipe path: kill ffmpeg if it is still
+    running (client disconnected mid-stream or before the body started),
+    log stderr if it failed partway through, release the download permit.
+    """
+    try:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        elif process.returncode != 0:
+            # The 200 is already committed; the truncated stream cannot be
+            # unsent, but the cause should not vanish with it
+            stderr = b''
+            if process.stderr is not None:
+                stderr = await process.stderr.read()
+            logger.error(
+                f"ffmpeg stream merge exited with {process.returncode}: "
+                f"{stderr.decode(errors='replace').strip()}"
+            )
+    finally:
+        _DOWNLOAD_SEMAPHORE.release()
+
+
+async def _finish_fd(fd: int) -> None:
+    """
+    Response-level cleanup for the streamed-descriptor path: close the
+    descriptor and release the download permit.
+    """
+    try:
+        os.close(fd)
+    except OSError:
+        pass
+    _DOWNLOAD_SEMAPHORE.release()
+
+
+class CallbackStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that awaits a cleanup callback when the response
+    finishes, started or not. A generator finalizer cannot cover the gap
+    between the route returning and the server iterating the body: a
+    client that disconnects in that window leaves the generator
+    unstarted, and aclose() on an unstarted generator skips its finally
+    block entirely, so cleanup hung on one would never run.
+    """
+
+    def __init__(self, *args, on_complete: Callable[[], Awaitable[None]], **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_complete = on_complete
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.on_complete()
+
+
+class ZeroCopyFileResponse(Response):
+    """
+    File response that uses the server's zero-copy ASGI extensions
+    (http.response.zerocopysend / http.response.pathsend) so the kernel
+    splices the file straight into the socket without the bytes ever
+    passing through Python. Only constructed when the serving ASGI
+    server advertises one of the extensions in the connection scope.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        fd: Optional[int] = None,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        on_complete: Optional[Callable[[], None]] = None,
+    ):
+        self.file_path = file_path
+        self.fd = fd
+        self.status_code = status_code
+        self.media_type = media_type
+        self.on_complete = on_complete
+        self.background = None
+        self.body = b""
+        self.init_headers(headers)
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self._send_file(scope, send)
+        finally:
+            if self.on_complete is not None:
+                self.on_complete()
 
+    async def _send_file(self, scope, send) -> None:
+        extensions = scope.get("extensions") or {}
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
 
-@router.get("/status")
+        if "http.response.zerocopysend" in extensions:
+            # The server takes ownership of the descriptor and closes it
+            fd = self.fd
+            if fd is None:
+                fd = await anyio.to_thread.run_sync(os.open, self.file_path, os.O_RDONLY)
+            await send({
+                "type": "http.response.zerocopysend",
+                "file": fd,
+                "more_body": False,
+            })
+        else:
+            # pathsend wants a path; an already-open descriptor is surplus
+            if self.fd is not None:
+                os.close(self.fd)
+            await send({
+                "type": "http.response.pathsend",
+                "path": self.file_path,
+            })
+
+
+# Dependency probes shell out to detect FFmpeg; availability only changes
+# when system tools are (un)installed, so cache the result briefly
+_STATUS_TTL_SECONDS = 60.0
+_status_cache: Optional[Tuple[float, ServerStatus]] = None
+
+
+def _cached_server_status() -> ServerStatus:
+    """Return the server status, refreshing at most once per TTL window"""
+    global _status_cache
+    now = time.monotonic()
+    if _status_cache is None or now - _status_cache[0] > _STATUS_TTL_SECONDS:
+        _status_cache = (now, get_ytdlp_service().get_server_status())
+    return _status_cache[1]
+
+
+@router.get("/status", response_class=ORJSONResponse)
 async def get_server_status():
     """
     Get server status including all dependencies.
-    
+
     Returns:
         Server status with backend, FFmpeg, and yt-dlp availability
     """
-    service = get_ytdlp_service()
-    status = service.get_server_status()
-    
+    status = _cached_server_status()
+
     return {
         "backend": status.backend,
         "ffmpeg": status.ffmpeg,
@@ -86,7 +268,7 @@ async def get_server_status():
     }
 
 
-@router.post("/info")
+@router.post("/info", response_model=ApiResponse, response_class=ORJSONResponse)
 async def get_video_info(request: VideoInfoRequest):
     """
     Fetch video metadata without downloading.
@@ -108,10 +290,10 @@ async def get_video_info(request: VideoInfoRequest):
     try:
         video_info = await service.fetch_video_info(request.url)
         
-        # Get available quality options
+        # Get available quality options (single pass, heights parsed inline)
         raw_formats = [
             {
-                'height': f.resolution.split('x')[-1] if f.resolution and 'x' in f.resolution else None,
+                'height': _height_from_resolution(f.resolution),
                 'vcodec': f.vcodec,
                 'acodec': f.acodec,
                 'abr': f.tbr,
@@ -119,22 +301,17 @@ async def get_video_info(request: VideoInfoRequest):
             }
             for f in video_info.formats
         ]
-        
-        # Convert height strings to integers where possible
-        for fmt in raw_formats:
-            if fmt['height']:
-                try:
-                    fmt['height'] = int(fmt['height'].replace('p', ''))
-                except (ValueError, AttributeError):
-                    fmt['height'] = None
-        
+
         video_qualities = service.get_available_video_qualities(raw_formats)
         audio_qualities = service.get_available_audio_qualities(raw_formats)
         
-        return ApiResponse(
-            success=True,
-            message="Video info fetched successfully",
-            data={
+        # Pre-built dict sent straight through orjson; ApiResponse stays as
+        # the declared response_model for the OpenAPI schema only, so the
+        # payload skips a full Pydantic validation walk
+        return ORJSONResponse({
+            "success": True,
+            "message": "Video info fetched successfully",
+            "data": {
                 "id": video_info.id,
                 "title": video_info.title,
                 "description": video_info.description[:500] if video_info.description else None,
@@ -171,7 +348,7 @@ async def get_video_info(request: VideoInfoRequest):
                     for q in audio_qualities
                 ],
             }
-        )
+        })
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -182,14 +359,14 @@ async def get_video_info(request: VideoInfoRequest):
 
 
 @router.post("/download")
-async def download_video(request: DownloadRequest, background_tasks: BackgroundTasks):
+async def download_video(request: DownloadRequest, http_request: Request):
     """
     Download video or audio with specified quality.
-    
+
     Args:
         request: Contains the video URL, download type, and quality
-        background_tasks: FastAPI background tasks for cleanup
-        
+        http_request: Raw request, used to detect server zero-copy support
+
     Returns:
         Streaming response with the video/audio file
     """
@@ -200,48 +377,117 @@ async def download_video(request: DownloadRequest, background_tasks: BackgroundT
         )
     
     service = get_ytdlp_service()
-    
+
+    # Held for the download AND the streaming lifetime, so in-flight
+    # working-set memory stays bounded under concurrent clients. Ownership
+    # transfers to the response's on_complete at each return; every other
+    # exit - errors and cancellation alike - releases the permit in the
+    # finally below.
+    await _DOWNLOAD_SEMAPHORE.acquire()
+    permit_transferred = False
     try:
-        # Download with specified options
+        # Pipe path: remux straight from the source to the client, skipping
+        # the write-to-disk-then-read-back pass entirely
+        if request.download_type == DownloadType.VIDEO:
+            try:
+                stream = await service.open_download_stream(request.url, request.quality)
+            except ValueError:
+                stream = None
+            if stream:
+                process, filename = stream
+                # Probe the pipe before committing the response: ffmpeg
+                # failing up front (expired or 403ing signed URLs are
+                # routine) must fall through to the disk path instead of
+                # streaming an empty 200
+                first_chunk = await process.stdout.read(STREAM_CHUNK_SIZE)
+                if first_chunk:
+                    safe_filename = _FILENAME_SAFE_RE.sub('_', filename)
+                    # No Content-Length: the merged size is unknown up front
+                    response = CallbackStreamingResponse(
+                        _pipe_iterator(process, first_chunk),
+                        media_type='video/mp4',
+                        headers={
+                            'Content-Disposition': f'attachment; filename="{safe_filename}"',
+                            'X-Content-Type-Options': 'nosniff',
+                        },
+                        on_complete=partial(_finish_pipe, process),
+                    )
+                    permit_transferred = True
+                    return response
+                await process.wait()
+                stderr = b''
+                if process.stderr is not None:
+                    stderr = await process.stderr.read()
+                logger.warning(
+                    f"ffmpeg stream merge produced no output (exit {process.returncode}): "
+                    f"{stderr.decode(errors='replace').strip()}; falling back to disk download"
+                )
+
+        # Disk-backed fallback for formats that need seekable output
         file_path, filename = await service.download_with_quality(
             url=request.url,
             download_type=request.download_type,
             quality=request.quality
         )
-        
-        # Get file size for Content-Length header
-        file_size = os.path.getsize(file_path)
-        
+
+        fd = os.open(file_path, os.O_RDONLY)
+
         # Determine content type based on extension
         ext = os.path.splitext(file_path)[1].lower()
-        content_types = {
-            '.mp4': 'video/mp4',
-            '.mkv': 'video/x-matroska',
-            '.webm': 'video/webm',
-            '.avi': 'video/x-msvideo',
-            '.mp3': 'audio/mpeg',
-            '.m4a': 'audio/mp4',
-            '.opus': 'audio/opus',
-            '.ogg': 'audio/ogg',
-        }
-        content_type = content_types.get(ext, 'application/octet-stream')
-        
-        # Schedule file cleanup after response is sent
-        background_tasks.add_task(cleanup_file_after_response, file_path, delay_seconds=300)
-        
+        content_type = _CONTENT_TYPES.get(ext, 'application/octet-stream')
+
         # Sanitize filename for Content-Disposition header
-        safe_filename = re.sub(r'[^\w\s\-_\.]', '_', filename)
-        
-        return StreamingResponse(
-            file_iterator(file_path),
+        safe_filename = _FILENAME_SAFE_RE.sub('_', filename)
+
+        unlinked = False
+        if os.name == 'posix':
+            # Unlink now: the open descriptor keeps the inode alive, so
+            # the blocks are reclaimed the instant the stream closes and
+            # the file never waits out a deletion window on disk
+            os.unlink(file_path)
+            unlinked = True
+        else:
+            # Windows cannot unlink an open file; defer the deletion
+            cleanup_file_after_response(file_path, delay_seconds=300)
+
+        # fstat on the already-open descriptor gives Content-Length without
+        # a separate stat(), and the same fd feeds the streaming iterator
+        file_size = os.fstat(fd).st_size
+
+        headers = {
+            'Content-Disposition': f'attachment; filename="{safe_filename}"',
+            'Content-Length': str(file_size),
+            'X-Content-Type-Options': 'nosniff',
+        }
+
+        # Zero-copy path: let the kernel splice the file into the socket.
+        # zerocopysend takes the descriptor, so it works on an unlinked
+        # file; pathsend needs the name to still exist.
+        extensions = http_request.scope.get("extensions") or {}
+        if "http.response.zerocopysend" in extensions or (
+            not unlinked and "http.response.pathsend" in extensions
+        ):
+            response = ZeroCopyFileResponse(
+                file_path,
+                fd=fd,
+                media_type=content_type,
+                headers=headers,
+                on_complete=_DOWNLOAD_SEMAPHORE.release,
+            )
+            permit_transferred = True
+            return response
+
+        # Fallback: batched async reads that overlap disk latency with sends;
+        # the response callback owns the descriptor, not the iterator
+        response = CallbackStreamingResponse(
+            uring_fd_iter(fd, close=False),
             media_type=content_type,
-            headers={
-                'Content-Disposition': f'attachment; filename="{safe_filename}"',
-                'Content-Length': str(file_size),
-                'X-Content-Type-Options': 'nosniff',
-            }
+            headers=headers,
+            on_complete=partial(_finish_fd, fd),
         )
-    
+        permit_transferred = True
+        return response
+
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -249,9 +495,12 @@ async def download_video(request: DownloadRequest, background_tasks: BackgroundT
             status_code=500,
             detail=f"Download failed: {str(e)}"
         )
+    finally:
+        if not permit_transferred:
+            _DOWNLOAD_SEMAPHORE.release()
 
 
-@router.get("/health")
+@router.get("/health", response_class=ORJSONResponse)
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "service": "yt-downloader"}
@@ -17,7 +17,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from controllers.download_controller import router as download_router
-from utils.file_cleanup import get_cleanup_manager
+from utils.file_cleanup import get_cleanup_manager, get_unlink_queue
 
 # Configure logging
 logging.basicConfig(
@@ -39,11 +39,16 @@ async def lifespan(app: FastAPI):
     cleanup_manager.start_periodic_cleanup(interval_minutes=15)
     logger.info(f"Temp downloads directory: {cleanup_manager.download_dir}")
     logger.info("Started periodic file cleanup")
-    
+
+    # Batched deferred deletions for streamed downloads
+    unlink_queue = get_unlink_queue()
+    unlink_queue.start()
+
     yield
-    
+
     # Shutdown
     logger.info("Shutting down YT-Downloader API...")
+    await unlink_queue.stop()
     cleanup_manager.stop_periodic_cleanup()
     logger.info("Stopped periodic file cleanup")
 
@@ -103,12 +108,26 @@ async def root():
 
 if __name__ == "__main__":
     import uvicorn
-    
-    # Run the server
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info",
-    )
+
+    if os.environ.get("ENV") == "production":
+        # C event loop (uvloop) + C HTTP parser (httptools), one worker per
+        # core; both ship with uvicorn[standard]
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=os.cpu_count(),
+            loop="uvloop",
+            http="httptools",
+            reload=False,
+            log_level="warning",
+        )
+    else:
+        # Development: auto-reload, defaults
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            log_level="info",
+        )
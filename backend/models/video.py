@@ -3,10 +3,13 @@ Video Models - Data structures for video metadata and formats.
 This layer handles data representation only, no HTTP or UI concerns.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 from enum import Enum
 
+# File size units, indexed by powers of 1024
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
 
 class FormatType(str, Enum):
     """Video format types"""
@@ -23,6 +26,7 @@ class DownloadType(str, Enum):
 
 class QualityOption(BaseModel):
     """Represents a quality option for download"""
+    model_config = ConfigDict(extra='ignore')
     quality_id: str
     label: str  # e.g., "1080p", "720p", "320kbps"
     resolution: Optional[str] = None  # For video
@@ -34,6 +38,7 @@ class QualityOption(BaseModel):
 
 class VideoFormat(BaseModel):
     """Represents a single video/audio format option"""
+    model_config = ConfigDict(extra='ignore')
     format_id: str
     extension: str
     resolution: Optional[str] = None
@@ -52,15 +57,16 @@ class VideoFormat(BaseModel):
         size = self.filesize or self.filesize_approx
         if not size:
             return "Unknown"
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024:
-                return f"{size:.1f} {unit}"
-            size /= 1024
-        return f"{size:.1f} TB"
+        # Pick the unit directly from the bit length instead of looping;
+        # the -1 keeps sizes just under a unit boundary (e.g. 512-1023
+        # bytes) in the lower unit
+        i = min((int(size).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        return f"{size / (1 << (i * 10)):.1f} {_SIZE_UNITS[i]}"
 
 
 class VideoInfo(BaseModel):
     """Complete video metadata"""
+    model_config = ConfigDict(extra='ignore')
     id: str
     title: str
     description: Optional[str] = None
@@ -79,10 +85,12 @@ class VideoInfo(BaseModel):
     @property
     def duration_formatted(self) -> str:
         """Human-readable duration"""
-        if not self.duration:
+        d = self.duration
+        if not d:
             return "Unknown"
-        hours, remainder = divmod(self.duration, 3600)
-        minutes, seconds = divmod(remainder, 60)
+        seconds = d % 60
+        minutes = (d // 60) % 60
+        hours = d // 3600
         if hours:
             return f"{hours}:{minutes:02d}:{seconds:02d}"
         return f"{minutes}:{seconds:02d}"
@@ -90,6 +98,7 @@ class VideoInfo(BaseModel):
 
 class DownloadRequest(BaseModel):
     """Request model for video download"""
+    model_config = ConfigDict(extra='ignore')
     url: str = Field(..., description="Video URL to download")
     download_type: DownloadType = Field(default=DownloadType.VIDEO, description="Type of download: video or audio")
     quality: Optional[str] = Field(default=None, description="Quality ID to download (e.g., '1080p', '720p', '320kbps')")
@@ -97,11 +106,13 @@ class DownloadRequest(BaseModel):
 
 class VideoInfoRequest(BaseModel):
     """Request model for fetching video info"""
+    model_config = ConfigDict(extra='ignore')
     url: str = Field(..., description="Video URL to fetch info for")
 
 
 class DownloadProgress(BaseModel):
     """Download progress information"""
+    model_config = ConfigDict(extra='ignore')
     status: str
     downloaded_bytes: Optional[int] = None
     total_bytes: Optional[int] = None
@@ -113,6 +124,7 @@ class DownloadProgress(BaseModel):
 
 class ApiResponse(BaseModel):
     """Standard API response wrapper"""
+    model_config = ConfigDict(extra='ignore')
     success: bool
     message: Optional[str] = None
     data: Optional[dict] = None
@@ -121,6 +133,7 @@ class ApiResponse(BaseModel):
 
 class ServerStatus(BaseModel):
     """Server status information"""
+    model_config = ConfigDict(extra='ignore')
     backend: bool = False
     ffmpeg: bool = False
     ytdlp: bool = False
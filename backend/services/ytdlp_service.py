@@ -5,10 +5,16 @@ Handles all yt-dlp interactions, format selection, and FFmpeg merging.
 
 import os
 import re
-import uuid
+import copy
+import hashlib
+import bisect
+import time
+import itertools
 import shutil
 import asyncio
+import threading
 from typing import Optional, Callable, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Default temp directory inside the project (backend/temp_downloads/)
@@ -49,6 +55,98 @@ AUDIO_QUALITIES = [
     {"id": "64kbps", "label": "Very Low (64 kbps)", "bitrate": 64},
 ]
 
+# Rung values extracted once so the per-request loops skip dict lookups
+VIDEO_QUALITY_HEIGHTS = tuple(q["height"] for q in VIDEO_QUALITIES)
+AUDIO_QUALITY_BITRATES = tuple(q["bitrate"] for q in AUDIO_QUALITIES)
+
+# Compiled once at import: characters invalid in Windows/Unix filenames
+_INVALID_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+# Per-process counter for unique output filenames; combined with the pid it
+# is collision-free across workers and far cheaper than slicing a uuid4
+_unique_counter = itertools.count()
+
+
+# Minimum seconds between progress callbacks; yt-dlp fires the hook for
+# every fragment and clients cannot render updates faster than this anyway
+_PROGRESS_INTERVAL = 0.25
+
+
+def _make_progress_hook(
+    progress_callback: Optional[Callable[[DownloadProgress], None]],
+    finished_status: str,
+) -> Optional[Callable[[dict], None]]:
+    """
+    Build a yt-dlp progress hook that forwards to the given callback.
+
+    Returns None when there is no callback, so the dispatcher skips the
+    hook entirely. Downloading events are rate-limited to ~4 Hz and the
+    DownloadProgress is assembled with model_construct, keeping Pydantic
+    validation out of a path that runs many times per second.
+
+    Args:
+        progress_callback: Caller-supplied progress consumer, if any
+        finished_status: Status to report when the download finishes
+            ("merging" or "processing")
+
+    Returns:
+        A hook suitable for yt-dlp's progress_hooks, or None
+    """
+    if progress_callback is None:
+        return None
+
+    last_sent = 0.0
+
+    def progress_hook(d: dict):
+        nonlocal last_sent
+
+        status = d['status']
+        if status == 'downloading':
+            now = time.monotonic()
+            if now - last_sent < _PROGRESS_INTERVAL:
+                return
+            last_sent = now
+
+            downloaded = d.get('downloaded_bytes')
+            total = d.get('total_bytes') or d.get('total_bytes_estimate')
+            progress_callback(DownloadProgress.model_construct(
+                status="downloading",
+                downloaded_bytes=downloaded,
+                total_bytes=total,
+                speed=d.get('speed'),
+                eta=d.get('eta'),
+                percentage=downloaded / total * 100 if downloaded and total else None,
+                filename=d.get('filename'),
+            ))
+        elif status == 'finished':
+            progress_callback(DownloadProgress.model_construct(
+                status=finished_status,
+                filename=d.get('filename'),
+                percentage=100.0,
+            ))
+
+    return progress_hook
+
+
+def _resolve_and_download(ydl: "yt_dlp.YoutubeDL", url: str, cached_info: Optional[Dict[str, Any]]) -> Optional[dict]:
+    """
+    Download via yt-dlp, feeding it an already-extracted info dict when one
+    is cached so the metadata round-trips are not repeated. The dict is
+    deep-copied because processing mutates it. Only failures to process
+    the cached dict fall back to a fresh extraction; a failure of the
+    download itself propagates, since retrying from scratch would mask the
+    error and repeat work already done.
+    """
+    if cached_info is not None:
+        try:
+            return ydl.process_ie_result(copy.deepcopy(cached_info), download=True)
+        except yt_dlp.utils.DownloadError:
+            raise
+        except Exception:
+            # Stale or malformed cached dict; extract fresh
+            pass
+    return ydl.extract_info(url, download=True)
+
 
 class YTDLPService:
     """Service class for yt-dlp operations"""
@@ -62,13 +160,141 @@ class YTDLPService:
         """
         self.download_dir = download_dir or DEFAULT_DOWNLOAD_DIR
         os.makedirs(self.download_dir, exist_ok=True)
+
+        # Raw metadata cache: url -> (monotonic deadline, info dict).
+        # Extraction costs seconds of HTTP round-trips and signature
+        # deciphering per URL; the UI fetches info and then downloads the
+        # same video moments later. TTL stays short of the lifetime of the
+        # signed media URLs embedded in the info dict.
+        self._info_cache: Dict[str, tuple] = {}
+        self._info_cache_ttl = float(os.environ.get("INFO_CACHE_TTL_SECONDS", "3600"))
+        self._info_cache_max = 256
+
+        # In-flight extractions by URL: concurrent requests for the same
+        # video await one shared future instead of each running yt-dlp
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        # FFmpeg availability does not change at runtime; probe lazily once
+        self._ffmpeg_available: Optional[bool] = None
+
+        # Player clients used for extraction. Rotating clients (web,
+        # android, ios) is the usual bot-detection mitigation; when
+        # YTDLP_PLAYER_CLIENTS is set, the list is passed to the extractor
+        # and folded into the info-cache key so results extracted under
+        # different rotations do not clobber one another. Unset, yt-dlp's
+        # own client defaults apply for maximum format availability.
+        clients = os.environ.get("YTDLP_PLAYER_CLIENTS", "")
+        self._player_clients = sorted(
+            c.strip() for c in clients.split(',') if c.strip()
+        )
+        if self._player_clients:
+            self._extractor_args = {'youtube': {'player_client': self._player_clients}}
+            self._cache_key_suffix = '|' + ','.join(self._player_clients)
+        else:
+            self._extractor_args = None
+            self._cache_key_suffix = '|default'
+
+        # yt-dlp tuning shared by extraction and downloads: a persistent
+        # cachedir keeps the deciphered player JS across calls (otherwise
+        # every extraction re-fetches base.js), timeouts/retries bound
+        # stalled connections, and parallel fragment fetches multiply
+        # throughput on DASH/HLS streams
+        self._ydl_tuning = {
+            'cachedir': os.path.join(self.download_dir, '.ytdlp-cache'),
+            'socket_timeout': 30,
+            'retries': 3,
+            'fragment_retries': 3,
+            'concurrent_fragment_downloads': 4,
+            'http_chunk_size': 10 << 20,
+        }
+        if self._extractor_args is not None:
+            self._ydl_tuning['extractor_args'] = self._extractor_args
+
+        # Dedicated bounded pools instead of the loop's default executor:
+        # yt-dlp calls are network-bound and can run for minutes, so letting
+        # them share the default pool would starve the short blocking tasks
+        # the framework dispatches there. Separate pools also cap how many
+        # extractions/downloads run at once.
+        self._extract_executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix='ytdlp-extract'
+        )
+        self._download_executor = ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix='ytdlp-download'
+        )
+
+        # Reused YoutubeDL instances, keyed by options set and confined to
+        # the worker thread that built them (threading.local, so no locking
+        # around the per-call params delta). Construction loads extractors
+        # and a fresh HTTP session each time; reuse keeps the connection
+        # pool and player-signature cache warm across requests.
+        self._ydl_local = threading.local()
     
     def _check_ffmpeg(self) -> bool:
-        """Check if FFmpeg is available in the system PATH"""
+        """
+        Check if FFmpeg is available in the system PATH.
+        The probe shells out, so the result is cached after the first call;
+        it previously ran on every download and status request.
+        """
+        if self._ffmpeg_available is not None:
+            return self._ffmpeg_available
+
+        self._ffmpeg_available = self._probe_ffmpeg()
+        return self._ffmpeg_available
+
+    def _dispatch_progress(self, d: dict) -> None:
+        """Forward a yt-dlp progress event to the hook installed for the
+        download running on this worker thread, if any"""
+        hook = getattr(self._ydl_local, 'progress_hook', None)
+        if hook is not None:
+            hook(d)
+
+    def _get_ydl(
+        self,
+        stable_opts: Dict[str, Any],
+        outtmpl: Optional[str] = None,
+        progress_hook: Optional[Callable[[dict], None]] = None,
+    ) -> yt_dlp.YoutubeDL:
+        """
+        Return a reusable YoutubeDL for this worker thread and options set.
+
+        Options that vary per call cannot go into the cache key: the output
+        template is read from params at use time so it is applied as a
+        delta, and progress events go through a permanent trampoline hook
+        that dispatches to this thread's current callback. Instances live
+        for the lifetime of their executor thread.
+
+        Args:
+            stable_opts: Options that identify the instance (format,
+                postprocessors, headers, ...)
+            outtmpl: Per-call output template, if downloading
+            progress_hook: Per-call progress callback, if any
+
+        Returns:
+            A YoutubeDL configured for this call
+        """
+        instances = getattr(self._ydl_local, 'instances', None)
+        if instances is None:
+            instances = self._ydl_local.instances = {}
+
+        key = repr(sorted(stable_opts.items()))
+        ydl = instances.get(key)
+        if ydl is None:
+            opts = dict(stable_opts)
+            opts['progress_hooks'] = [self._dispatch_progress]
+            ydl = instances[key] = yt_dlp.YoutubeDL(opts)
+
+        if outtmpl is not None:
+            ydl.params['outtmpl']['default'] = outtmpl
+        self._ydl_local.progress_hook = progress_hook
+        return ydl
+
+    @staticmethod
+    def _probe_ffmpeg() -> bool:
+        """Detect an FFmpeg binary via PATH lookup, then a direct run"""
         # First try shutil.which
         if shutil.which('ffmpeg') is not None:
             return True
-        
+
         # Fallback: try to run ffmpeg directly
         import subprocess
         try:
@@ -107,18 +333,30 @@ class YTDLPService:
             List of available quality options (sorted high to low)
         """
         available_heights = set()
-        
+
         for fmt in formats:
             height = fmt.get('height')
             vcodec = fmt.get('vcodec', 'none')
             if height and vcodec and vcodec != 'none':
                 available_heights.add(height)
-        
+
+        # Sorted once; each rung finds its nearest neighbor by bisection
+        # instead of a linear min() scan with a Python-level key
+        heights = sorted(available_heights)
+
         quality_options = []
-        for q in VIDEO_QUALITIES:
-            # Find the closest available height
-            closest_height = min(available_heights, key=lambda h: abs(h - q["height"]), default=None)
-            if closest_height and abs(closest_height - q["height"]) <= 100:  # Within 100px tolerance
+        for q, target in zip(VIDEO_QUALITIES, VIDEO_QUALITY_HEIGHTS):
+            if not heights:
+                break
+            i = bisect.bisect_left(heights, target)
+            if i == 0:
+                closest_height = heights[0]
+            elif i == len(heights):
+                closest_height = heights[-1]
+            else:
+                below, above = heights[i - 1], heights[i]
+                closest_height = above if above - target < target - below else below
+            if abs(closest_height - target) <= 100:  # Within 100px tolerance
                 quality_options.append(QualityOption(
                     quality_id=q["id"],
                     label=q["label"],
@@ -126,8 +364,8 @@ class YTDLPService:
                     height=closest_height,
                     format_type=DownloadType.VIDEO
                 ))
-                available_heights.discard(closest_height)
-        
+                heights.remove(closest_height)
+
         return quality_options
     
     def get_available_audio_qualities(self, formats: List[dict]) -> List[QualityOption]:
@@ -140,26 +378,26 @@ class YTDLPService:
         Returns:
             List of available quality options (sorted high to low)
         """
-        max_bitrate = 0
-        
-        for fmt in formats:
-            acodec = fmt.get('acodec', 'none')
-            if acodec and acodec != 'none':
-                abr = fmt.get('abr', 0) or fmt.get('tbr', 0) or 0
-                if abr > max_bitrate:
-                    max_bitrate = abr
-        
-        # Return audio qualities up to the max available
-        quality_options = []
-        for q in AUDIO_QUALITIES:
-            if q["bitrate"] <= max_bitrate + 50:  # 50kbps tolerance
-                quality_options.append(QualityOption(
-                    quality_id=q["id"],
-                    label=q["label"],
-                    bitrate=q["bitrate"],
-                    format_type=DownloadType.AUDIO
-                ))
-        
+        max_bitrate = max(
+            (fmt.get('abr', 0) or fmt.get('tbr', 0) or 0
+             for fmt in formats
+             if fmt.get('acodec', 'none') and fmt.get('acodec', 'none') != 'none'),
+            default=0,
+        )
+
+        # Return audio qualities up to the max available (50kbps tolerance)
+        threshold = max_bitrate + 50
+        quality_options = [
+            QualityOption(
+                quality_id=q["id"],
+                label=q["label"],
+                bitrate=bitrate,
+                format_type=DownloadType.AUDIO
+            )
+            for q, bitrate in zip(AUDIO_QUALITIES, AUDIO_QUALITY_BITRATES)
+            if bitrate <= threshold
+        ]
+
         # If no qualities matched, add at least the standard quality
         if not quality_options:
             quality_options.append(QualityOption(
@@ -186,9 +424,18 @@ class YTDLPService:
         else:
             return FormatType.AUDIO_ONLY
     
-    def _parse_format(self, fmt: dict) -> VideoFormat:
-        """Parse yt-dlp format dict into VideoFormat model"""
-        return VideoFormat(
+    def _parse_format(self, fmt: dict, format_type: Optional[FormatType] = None) -> VideoFormat:
+        """
+        Parse yt-dlp format dict into VideoFormat model.
+        Callers that already classified the format pass format_type in so
+        the codec strings are not re-examined.
+        """
+        if format_type is None:
+            format_type = self._get_format_type(fmt)
+        # model_construct skips per-field validation; the values come
+        # straight from yt-dlp and are already the right types, and a video
+        # can carry 40+ formats per info fetch
+        return VideoFormat.model_construct(
             format_id=fmt.get('format_id', ''),
             extension=fmt.get('ext', ''),
             resolution=fmt.get('resolution') or f"{fmt.get('width', '?')}x{fmt.get('height', '?')}",
@@ -198,103 +445,186 @@ class YTDLPService:
             fps=fmt.get('fps'),
             vcodec=fmt.get('vcodec'),
             acodec=fmt.get('acodec'),
-            format_type=self._get_format_type(fmt),
+            format_type=format_type,
             tbr=fmt.get('tbr')
         )
     
-    def _select_best_formats(self, formats: list) -> tuple[Optional[VideoFormat], Optional[VideoFormat]]:
+    def _parse_and_select_formats(
+        self, raw_formats: list
+    ) -> tuple[List[VideoFormat], Optional[VideoFormat], Optional[VideoFormat]]:
         """
-        Select the best video and audio formats for merging.
-        
+        Parse all formats and select the best video and audio candidates
+        for merging in a single pass over the raw format list, instead of
+        parsing once for the response and again for best-selection.
+
         Returns:
-            Tuple of (best_video_format, best_audio_format)
+            Tuple of (parsed_formats, best_video_format, best_audio_format)
         """
-        video_formats = []
-        audio_formats = []
-        
-        for fmt in formats:
-            format_type = self._get_format_type(fmt)
-            parsed = self._parse_format(fmt)
-            
-            if format_type == FormatType.VIDEO_ONLY:
-                video_formats.append((fmt, parsed))
-            elif format_type == FormatType.AUDIO_ONLY:
-                audio_formats.append((fmt, parsed))
-        
-        # Sort video by resolution (height) and bitrate
-        best_video = None
-        if video_formats:
-            video_formats.sort(
-                key=lambda x: (
-                    x[0].get('height', 0) or 0,
-                    x[0].get('tbr', 0) or 0
-                ),
-                reverse=True
-            )
-            best_video = video_formats[0][1]
-        
-        # Sort audio by bitrate
-        best_audio = None
-        if audio_formats:
-            audio_formats.sort(
-                key=lambda x: x[0].get('abr', 0) or x[0].get('tbr', 0) or 0,
-                reverse=True
-            )
-            best_audio = audio_formats[0][1]
-        
-        return best_video, best_audio
+        formats: List[VideoFormat] = []
+
+        # Running maxima: video ranked by (height, tbr), audio by bitrate.
+        # Tracking scalars beats collecting and sorting two lists just to
+        # take element [0].
+        best_video = best_audio = None
+        best_video_key = (-1, -1.0)
+        best_audio_key = -1.0
+
+        for fmt in raw_formats:
+            # Classify once per format; parsing and best-selection below
+            # reuse the booleans instead of re-checking the codec strings
+            vcodec = fmt.get('vcodec', 'none')
+            acodec = fmt.get('acodec', 'none')
+            has_video = bool(vcodec) and vcodec != 'none'
+            has_audio = bool(acodec) and acodec != 'none'
+            if has_video and has_audio:
+                format_type = FormatType.VIDEO_AUDIO
+            elif has_video:
+                format_type = FormatType.VIDEO_ONLY
+            else:
+                format_type = FormatType.AUDIO_ONLY
+
+            try:
+                parsed = self._parse_format(fmt, format_type)
+            except Exception:
+                continue  # Skip malformed formats
+            formats.append(parsed)
+
+            if has_video and not has_audio:
+                key = (fmt.get('height', 0) or 0, fmt.get('tbr', 0) or 0)
+                if key > best_video_key:
+                    best_video, best_video_key = parsed, key
+            elif has_audio and not has_video:
+                key = fmt.get('abr', 0) or fmt.get('tbr', 0) or 0
+                if key > best_audio_key:
+                    best_audio, best_audio_key = parsed, key
+
+        return formats, best_video, best_audio
     
-    async def fetch_video_info(self, url: str) -> VideoInfo:
+    def _cache_key(self, url: str) -> str:
         """
-        Fetch video metadata without downloading.
-        
+        Info-cache key for a URL under the configured player clients.
+        Including the client list keeps results extracted under one
+        rotation from being served after the rotation changes.
+        """
+        return hashlib.blake2b(
+            (url + self._cache_key_suffix).encode(), digest_size=16
+        ).hexdigest()
+
+    def _cached_info(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return a cached info dict for the URL if it has not expired"""
+        key = self._cache_key(url)
+        entry = self._info_cache.get(key)
+        if entry is None:
+            return None
+        deadline, info = entry
+        if time.monotonic() > deadline:
+            del self._info_cache[key]
+            return None
+        return info
+
+    def _store_info(self, url: str, info: Dict[str, Any]) -> None:
+        """Cache an info dict for the URL, evicting the stalest entry if full"""
+        if len(self._info_cache) >= self._info_cache_max:
+            oldest = min(self._info_cache, key=lambda k: self._info_cache[k][0])
+            del self._info_cache[oldest]
+        self._info_cache[self._cache_key(url)] = (time.monotonic() + self._info_cache_ttl, info)
+
+    def invalidate(self, url: str) -> None:
+        """Drop any cached metadata for the URL (refresh affordance)"""
+        self._info_cache.pop(self._cache_key(url), None)
+
+    async def _extract_info(self, url: str) -> Dict[str, Any]:
+        """
+        Extract raw video metadata without downloading.
+        Served from the TTL cache when a fresh entry exists, so the info
+        fetch and the download that typically follows it pay for one
+        extraction, not two.
+
         Args:
             url: Video URL to extract info from
-            
+
         Returns:
-            VideoInfo object with metadata and available formats
-            
+            Raw yt-dlp info dict
+
         Raises:
             ValueError: If URL is invalid or video not found
         """
+        cached = self._cached_info(url)
+        if cached is not None:
+            return cached
+
+        # Single-flight: if another task is already extracting this URL,
+        # share its result rather than paying the multi-second cost twice
+        existing = self._inflight.get(url)
+        if existing is not None:
+            return await existing
+
         ydl_opts = {
+            **self._ydl_tuning,
             'quiet': True,
             'no_warnings': True,
             'extract_flat': False,
-            # Use default player clients for maximum format availability
             'http_headers': {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
             },
         }
-        
+
         loop = asyncio.get_event_loop()
-        
+
         def extract():
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                return ydl.extract_info(url, download=False)
-        
+            ydl = self._get_ydl(ydl_opts)
+            return ydl.extract_info(url, download=False)
+
+        future: asyncio.Future = loop.create_future()
+        self._inflight[url] = future
         try:
-            info = await loop.run_in_executor(None, extract)
-        except yt_dlp.utils.DownloadError as e:
-            raise ValueError(f"Failed to extract video info: {str(e)}")
-        except Exception as e:
-            raise ValueError(f"An error occurred: {str(e)}")
-        
-        if not info:
-            raise ValueError("Could not extract video information")
-        
-        # Parse all formats
-        formats = []
-        raw_formats = info.get('formats', [])
-        for fmt in raw_formats:
             try:
-                formats.append(self._parse_format(fmt))
-            except Exception:
-                continue  # Skip malformed formats
-        
-        # Select best formats
-        best_video, best_audio = self._select_best_formats(raw_formats)
-        
+                info = await loop.run_in_executor(self._extract_executor, extract)
+            except yt_dlp.utils.DownloadError as e:
+                raise ValueError(f"Failed to extract video info: {str(e)}")
+            except Exception as e:
+                raise ValueError(f"An error occurred: {str(e)}")
+
+            if not info:
+                raise ValueError("Could not extract video information")
+
+            self._store_info(url, info)
+            future.set_result(info)
+        except ValueError as e:
+            future.set_exception(e)
+            # Waiters receive the exception; mark it retrieved so a
+            # waiterless failure does not log a never-retrieved warning
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(url, None)
+            # A cancelled leader never resolved the future; cancel it so
+            # waiters are released instead of hanging forever
+            if not future.done():
+                future.cancel()
+
+        return info
+
+    async def fetch_video_info(self, url: str) -> VideoInfo:
+        """
+        Fetch video metadata without downloading.
+
+        Args:
+            url: Video URL to extract info from
+
+        Returns:
+            VideoInfo object with metadata and available formats
+
+        Raises:
+            ValueError: If URL is invalid or video not found
+        """
+        info = await self._extract_info(url)
+
+        # Parse all formats and select the best in the same pass
+        formats, best_video, best_audio = self._parse_and_select_formats(
+            info.get('formats', [])
+        )
+
         return VideoInfo(
             id=info.get('id', ''),
             title=info.get('title', 'Unknown'),
@@ -312,11 +642,36 @@ class YTDLPService:
             best_audio_format=best_audio
         )
     
+    def _find_output_file(self, base: str, extensions: List[str]) -> Optional[str]:
+        """
+        Locate the downloaded file among candidate extensions using one
+        directory snapshot (a single getdents) instead of issuing a stat()
+        per candidate.
+
+        Args:
+            base: Output path with the extension stripped
+            extensions: Candidate extensions, in preference order
+
+        Returns:
+            Full path of the first matching candidate, or None
+        """
+        prefix = os.path.basename(base)
+        try:
+            with os.scandir(self.download_dir) as entries:
+                names = {e.name for e in entries if e.name.startswith(prefix)}
+        except OSError:
+            return None
+
+        for ext in extensions:
+            candidate = prefix + ext
+            if candidate in names:
+                return os.path.join(self.download_dir, candidate)
+        return None
+
     def _sanitize_filename(self, filename: str) -> str:
         """Remove or replace characters that are invalid in filenames"""
         # Remove invalid characters for Windows/Unix
-        invalid_chars = r'[<>:"/\\|?*]'
-        sanitized = re.sub(invalid_chars, '_', filename)
+        sanitized = _INVALID_FILENAME_RE.sub('_', filename)
         # Remove leading/trailing spaces and dots
         sanitized = sanitized.strip(' .')
         # Limit length
@@ -343,47 +698,22 @@ class YTDLPService:
             ValueError: If download fails
         """
         # Generate unique filename to avoid conflicts
-        unique_id = str(uuid.uuid4())[:8]
+        unique_id = f'{os.getpid():x}_{next(_unique_counter):x}'
         output_template = os.path.join(
             self.download_dir, 
             f'%(title)s_{unique_id}.%(ext)s'
         )
         
-        progress_info = DownloadProgress(status="starting")
-        
-        def progress_hook(d: dict):
-            nonlocal progress_info
-            
-            if d['status'] == 'downloading':
-                progress_info = DownloadProgress(
-                    status="downloading",
-                    downloaded_bytes=d.get('downloaded_bytes'),
-                    total_bytes=d.get('total_bytes') or d.get('total_bytes_estimate'),
-                    speed=d.get('speed'),
-                    eta=d.get('eta'),
-                    filename=d.get('filename')
-                )
-                if progress_info.total_bytes and progress_info.downloaded_bytes:
-                    progress_info.percentage = (
-                        progress_info.downloaded_bytes / progress_info.total_bytes * 100
-                    )
-            elif d['status'] == 'finished':
-                progress_info = DownloadProgress(
-                    status="merging",
-                    filename=d.get('filename'),
-                    percentage=100.0
-                )
-            
-            if progress_callback:
-                progress_callback(progress_info)
-        
+        progress_hook = _make_progress_hook(progress_callback, "merging")
+
         # Check if FFmpeg is available
         ffmpeg_available = self._check_ffmpeg()
         
         # Common options to help bypass bot detection
+        # (outtmpl and the progress hook vary per call and are applied as a
+        # delta by _get_ydl)
         common_opts = {
-            'outtmpl': output_template,
-            'progress_hooks': [progress_hook],
+            **self._ydl_tuning,
             'quiet': True,
             'no_warnings': True,
             'http_headers': {
@@ -396,10 +726,16 @@ class YTDLPService:
             ydl_opts = {
                 **common_opts,
                 'format': 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/bestvideo+bestaudio/best',
+                # The merger remuxes into mp4 with stream copy; a
+                # FFmpegVideoConvertor on top would re-run ffmpeg over the
+                # already-mp4 output
                 'merge_output_format': 'mp4',
-                # FFmpeg post-processor for merging
+                # merge_output_format only applies when separate streams
+                # are merged; when the /best fallback selects a single
+                # progressive format the remuxer stream-copies it into mp4
+                # (and skips files that already are)
                 'postprocessors': [{
-                    'key': 'FFmpegVideoConvertor',
+                    'key': 'FFmpegVideoRemuxer',
                     'preferedformat': 'mp4',
                 }],
             }
@@ -411,24 +747,24 @@ class YTDLPService:
             }
         
         loop = asyncio.get_event_loop()
-        
+        cached_info = self._cached_info(url)
+
         def download():
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
-                # Get the actual output filename
-                if info:
-                    filename = ydl.prepare_filename(info)
-                    # Handle potential extension change after merge
-                    base, _ = os.path.splitext(filename)
-                    for ext in ['.mp4', '.mkv', '.webm']:
-                        potential_file = base + ext
-                        if os.path.exists(potential_file):
-                            return potential_file, info.get('title', 'video')
-                    return filename, info.get('title', 'video')
-                return None, None
+            ydl = self._get_ydl(ydl_opts, outtmpl=output_template, progress_hook=progress_hook)
+            info = _resolve_and_download(ydl, url, cached_info)
+            # Get the actual output filename
+            if info:
+                filename = ydl.prepare_filename(info)
+                # Handle potential extension change after merge
+                base, _ = os.path.splitext(filename)
+                found = self._find_output_file(base, ['.mp4', '.mkv', '.webm'])
+                if found:
+                    return found, info.get('title', 'video')
+                return filename, info.get('title', 'video')
+            return None, None
         
         try:
-            file_path, title = await loop.run_in_executor(None, download)
+            file_path, title = await loop.run_in_executor(self._download_executor, download)
         except yt_dlp.utils.DownloadError as e:
             raise ValueError(f"Download failed: {str(e)}")
         except Exception as e:
@@ -473,46 +809,19 @@ class YTDLPService:
         Raises:
             ValueError: If download fails
         """
-        unique_id = str(uuid.uuid4())[:8]
+        unique_id = f'{os.getpid():x}_{next(_unique_counter):x}'
         output_template = os.path.join(
             self.download_dir,
             f'%(title)s_{unique_id}.%(ext)s'
         )
         
-        progress_info = DownloadProgress(status="starting")
-        
-        def progress_hook(d: dict):
-            nonlocal progress_info
-            
-            if d['status'] == 'downloading':
-                progress_info = DownloadProgress(
-                    status="downloading",
-                    downloaded_bytes=d.get('downloaded_bytes'),
-                    total_bytes=d.get('total_bytes') or d.get('total_bytes_estimate'),
-                    speed=d.get('speed'),
-                    eta=d.get('eta'),
-                    filename=d.get('filename')
-                )
-                if progress_info.total_bytes and progress_info.downloaded_bytes:
-                    progress_info.percentage = (
-                        progress_info.downloaded_bytes / progress_info.total_bytes * 100
-                    )
-            elif d['status'] == 'finished':
-                progress_info = DownloadProgress(
-                    status="processing",
-                    filename=d.get('filename'),
-                    percentage=100.0
-                )
-            
-            if progress_callback:
-                progress_callback(progress_info)
-        
+        progress_hook = _make_progress_hook(progress_callback, "processing")
+
         ffmpeg_available = self._check_ffmpeg()
         
-        # Common options
+        # Common options (per-call outtmpl/progress hook applied by _get_ydl)
         common_opts = {
-            'outtmpl': output_template,
-            'progress_hooks': [progress_hook],
+            **self._ydl_tuning,
             'quiet': True,
             'no_warnings': True,
             'http_headers': {
@@ -550,43 +859,46 @@ class YTDLPService:
             ydl_opts = {
                 **common_opts,
                 'format': format_str,
+                # Merging already remuxes to mp4 (stream copy); no separate
+                # FFmpegVideoConvertor pass is needed on top of it
                 'merge_output_format': 'mp4' if ffmpeg_available else None,
             }
-            
+
             if ffmpeg_available:
+                # Covers the no-merge case: a single progressive format
+                # bypasses the merger, so stream-copy it into mp4 (a no-op
+                # for files that already are)
                 ydl_opts['postprocessors'] = [{
-                    'key': 'FFmpegVideoConvertor',
+                    'key': 'FFmpegVideoRemuxer',
                     'preferedformat': 'mp4',
                 }]
         
         loop = asyncio.get_event_loop()
-        
+        cached_info = self._cached_info(url)
+
         def download():
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=True)
-                if info:
-                    filename = ydl.prepare_filename(info)
-                    base, _ = os.path.splitext(filename)
-                    
-                    # Check for different extensions based on download type
-                    if download_type == DownloadType.AUDIO:
-                        extensions = ['.mp3', '.m4a', '.webm', '.opus']
-                    else:
-                        extensions = ['.mp4', '.mkv', '.webm']
-                    
-                    for ext in extensions:
-                        potential_file = base + ext
-                        if os.path.exists(potential_file):
-                            return potential_file, info.get('title', 'video')
-                    
-                    # Check if original file exists
-                    if os.path.exists(filename):
-                        return filename, info.get('title', 'video')
-                    
-                return None, None
+            ydl = self._get_ydl(ydl_opts, outtmpl=output_template, progress_hook=progress_hook)
+            info = _resolve_and_download(ydl, url, cached_info)
+            if info:
+                filename = ydl.prepare_filename(info)
+                base, ext = os.path.splitext(filename)
+
+                # Check for different extensions based on download type
+                if download_type == DownloadType.AUDIO:
+                    extensions = ['.mp3', '.m4a', '.webm', '.opus']
+                else:
+                    extensions = ['.mp4', '.mkv', '.webm']
+
+                # One directory snapshot covers the candidates and the
+                # original filename
+                found = self._find_output_file(base, extensions + [ext])
+                if found:
+                    return found, info.get('title', 'video')
+
+            return None, None
         
         try:
-            file_path, title = await loop.run_in_executor(None, download)
+            file_path, title = await loop.run_in_executor(self._download_executor, download)
         except yt_dlp.utils.DownloadError as e:
             raise ValueError(f"Download failed: {str(e)}")
         except Exception as e:
@@ -609,6 +921,106 @@ class YTDLPService:
         return file_path, download_filename
 
 
+    def _pick_stream_sources(self, info: Dict[str, Any], quality: Optional[str] = None) -> Optional[tuple[str, str]]:
+        """
+        Pick the best direct video and audio URLs suitable for an ffmpeg
+        stream-copy merge.
+
+        Args:
+            info: Raw yt-dlp info dict
+            quality: Optional quality ID capping the video height
+
+        Returns:
+            Tuple of (video_url, audio_url), or None if no usable pair exists
+        """
+        height_cap = None
+        if quality:
+            h = quality.replace('p', '')
+            if h.isdigit():
+                height_cap = int(h)
+
+        best_video = best_audio = None
+        best_video_key = (-1, -1.0)
+        best_audio_key = -1.0
+
+        for fmt in info.get('formats', []):
+            url = fmt.get('url')
+            # ffmpeg needs a plain http(s) source for a copy-merge
+            if not url or not str(fmt.get('protocol', 'https')).startswith('http'):
+                continue
+
+            vcodec = fmt.get('vcodec', 'none')
+            acodec = fmt.get('acodec', 'none')
+            has_video = vcodec and vcodec != 'none'
+            has_audio = acodec and acodec != 'none'
+
+            if has_video and not has_audio:
+                height = fmt.get('height') or 0
+                if height_cap and height > height_cap:
+                    continue
+                key = (height, fmt.get('tbr') or 0)
+                if key > best_video_key:
+                    best_video, best_video_key = url, key
+            elif has_audio and not has_video:
+                key = fmt.get('abr') or fmt.get('tbr') or 0
+                if key > best_audio_key:
+                    best_audio, best_audio_key = url, key
+
+        if best_video and best_audio:
+            return best_video, best_audio
+        return None
+
+    async def open_download_stream(
+        self,
+        url: str,
+        quality: Optional[str] = None,
+    ) -> Optional[tuple[asyncio.subprocess.Process, str]]:
+        """
+        Start an ffmpeg stream-copy merge that writes fragmented MP4 to
+        stdout, so the response can be piped to the client without first
+        buffering the whole file to disk.
+
+        Args:
+            url: Video URL to stream
+            quality: Optional quality ID (e.g. "1080p")
+
+        Returns:
+            Tuple of (process, filename) whose stdout carries the MP4, or
+            None when streaming is not possible (no ffmpeg, or no direct
+            http video+audio pair)
+
+        Raises:
+            ValueError: If metadata extraction fails
+        """
+        if not self._check_ffmpeg():
+            return None
+
+        info = await self._extract_info(url)
+        sources = self._pick_stream_sources(info, quality)
+        if not sources:
+            return None
+        video_url, audio_url = sources
+
+        safe_title = self._sanitize_filename(info.get('title', 'video'))
+
+        # Fragmented MP4: pipe output is not seekable, so the moov atom
+        # has to come first; -c copy keeps it a remux, not a transcode
+        process = await asyncio.create_subprocess_exec(
+            'ffmpeg', '-hide_banner', '-loglevel', 'error',
+            '-i', video_url,
+            '-i', audio_url,
+            '-c', 'copy',
+            '-f', 'mp4',
+            '-movflags', 'frag_keyframe+empty_moov',
+            'pipe:1',
+            stdout=asyncio.subprocess.PIPE,
+            # -loglevel error keeps stderr small enough to buffer in the
+            # pipe; the caller reads it when ffmpeg fails
+            stderr=asyncio.subprocess.PIPE,
+        )
+        return process, f"{safe_title}.mp4"
+
+
 # Singleton instance for the service
 _service_instance: Optional[YTDLPService] = None
 
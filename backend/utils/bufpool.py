@@ -0,0 +1,40 @@
+"""
+Buffer Pool - Reusable read buffers for the download streaming path.
+A 500 MB download streamed in fixed-size chunks would otherwise allocate
+one short-lived bytes object per chunk; recycling bytearrays through a
+small LIFO free-list keeps steady-state allocations on the hot path flat.
+"""
+
+import threading
+from typing import List
+
+
+class BufPool:
+    """Bounded LIFO pool of fixed-size bytearray read buffers"""
+
+    def __init__(self, buf_size: int, max_buffers: int = 16):
+        """
+        Initialize the buffer pool.
+
+        Args:
+            buf_size: Size of each buffer in bytes
+            max_buffers: Maximum number of idle buffers retained; returns
+                beyond this are dropped so the pool cannot grow unbounded
+        """
+        self.buf_size = buf_size
+        self.max_buffers = max_buffers
+        self._free: List[bytearray] = []
+        self._lock = threading.Lock()
+
+    def get(self) -> bytearray:
+        """Take a buffer from the pool, allocating one if none are idle"""
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+        return bytearray(self.buf_size)
+
+    def put(self, buf: bytearray) -> None:
+        """Return a buffer to the pool; excess buffers are discarded"""
+        with self._lock:
+            if len(self._free) < self.max_buffers:
+                self._free.append(buf)
@@ -0,0 +1,92 @@
+"""
+Async File Reader - Batched, overlapped disk reads for response streaming.
+Keeps a sliding window of in-flight reads ahead of the socket writer so
+disk latency overlaps with network sends instead of alternating with them.
+
+The design mirrors an io_uring submission/completion queue: up to `depth`
+positional reads (os.preadv) are submitted ahead of the consumer on the
+event loop's executor and completions are drained in file order.
+"""
+
+import os
+import asyncio
+import logging
+from collections import deque
+from typing import AsyncGenerator
+
+from utils.bufpool import BufPool
+
+logger = logging.getLogger(__name__)
+
+# 1 MiB chunks amortize per-read overhead on large media files
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Number of reads kept in flight ahead of the consumer
+DEFAULT_QUEUE_DEPTH = 8
+
+# Shared pool of read buffers; bounded so concurrent downloads cannot
+# accumulate idle buffers without limit
+_READ_BUF_POOL = BufPool(DEFAULT_CHUNK_SIZE, max_buffers=2 * DEFAULT_QUEUE_DEPTH)
+
+
+async def uring_fd_iter(
+    fd: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    depth: int = DEFAULT_QUEUE_DEPTH,
+    close: bool = True,
+) -> AsyncGenerator[bytes, None]:
+    """
+    Asynchronously yield chunks from an open descriptor with up to `depth`
+    reads in flight. Takes ownership of the descriptor and closes it
+    unless `close` is False, for callers that tie the descriptor's
+    lifetime to something longer-lived than this generator.
+
+    Args:
+        fd: Open file descriptor to read from
+        chunk_size: Size of each read in bytes
+        depth: Maximum number of reads submitted ahead of the consumer
+        close: Whether to close the descriptor when the generator finishes
+
+    Yields:
+        Bytes chunks of the file, in order
+    """
+    loop = asyncio.get_running_loop()
+    pending: deque = deque()
+    # Pooled buffers are sized for the default chunk; custom sizes allocate fresh
+    pooled = chunk_size == _READ_BUF_POOL.buf_size
+    try:
+        size = os.fstat(fd).st_size
+        next_offset = 0
+
+        while next_offset < size or pending:
+            # Submit reads until the window is full (one batch, not one-at-a-time)
+            while next_offset < size and len(pending) < depth:
+                buf = _READ_BUF_POOL.get() if pooled else bytearray(chunk_size)
+                pending.append(
+                    (buf, loop.run_in_executor(None, os.preadv, fd, [buf], next_offset))
+                )
+                next_offset += chunk_size
+
+            # Drain the oldest completion; later reads keep progressing meanwhile
+            buf, future = pending.popleft()
+            n = await future
+            if n:
+                # Yield an immutable copy: transports may keep a zero-copy
+                # reference to what they were handed until the socket
+                # drains, so the pooled buffer must not be visible there
+                # when a later preadv overwrites it
+                yield bytes(memoryview(buf)[:n])
+            if pooled:
+                _READ_BUF_POOL.put(buf)
+    finally:
+        # Let any in-flight reads finish before the descriptor goes away
+        while pending:
+            buf, future = pending.popleft()
+            try:
+                await future
+            except Exception:
+                pass
+            if pooled:
+                _READ_BUF_POOL.put(buf)
+        if close:
+            os.close(fd)